@@ -1,10 +1,28 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import datetime
-import matplotlib.pyplot as plt
-import pandas as pd
+import csv
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 import os
-from io import StringIO
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from collections import namedtuple
+from io import StringIO, BytesIO
+
+from irrigation_scoring import score_batch
+
+try:
+    import orjson
+    parse_json = orjson.loads
+except ImportError:  # orjson is optional; stdlib json handles the same payloads
+    import json
+    parse_json = json.loads
 
 # Set page config
 st.set_page_config(page_title="Smart Irrigation Advisory", page_icon="🌾", layout="centered")
@@ -17,117 +35,434 @@ crop_type = st.selectbox("Select Crop Type:", ["Wheat", "Rice", "Cotton", "Sugar
 soil_moisture = st.slider("Enter Soil Moisture Level (%):", 0, 100, 50)
 language = st.selectbox("Select Language:", ["English", "Gujarati", "Hindi"])
 
-# Language Dictionary (basic multilingual support)
-translations = {
-    "English": {
-        "weather": "Weather Data",
-        "temperature": "Temperature",
-        "humidity": "Humidity",
-        "rainfall": "Rainfall (last 1hr)",
-        "condition": "Condition",
-        "advice": "Irrigation Advice",
-        "recommended": "Irrigation Recommended",
-        "not_needed": "No Irrigation Needed",
-        "saving_score": "Water Saving Score",
-        "error_weather": "Unable to fetch weather data. Please check your location.",
-        "error_api": "Weather service temporarily unavailable. Please try again later."
-    },
-    "Gujarati": {
-        "weather": "હવામાન માહિતી",
-        "temperature": "તાપમાન",
-        "humidity": "ભેજ",
-        "rainfall": "વર્ષા (છેલ્લા 1 કલાકમાં)",
-        "condition": "હવામાન સ્થિતિ",
-        "advice": "સિંચાઇ સલાહ",
-        "recommended": "સિંચાઇ કરવાની ભલામણ છે",
-        "not_needed": "સિંચાઇની જરૂર નથી",
-        "saving_score": "પાણી બચાવ સ્કોર",
-        "error_weather": "હવામાન માહિતી મેળવવામાં અસમર્થ. કૃપા કરીને તમારું સ્થાન તપાસો.",
-        "error_api": "હવામાન સેવા અસ્થાયી રૂપે અનુપલબ્ધ છે. કૃપા કરીને ફરીથી પ્રયાસ કરો."
-    },
-    "Hindi": {
-        "weather": "मौसम की जानकारी",
-        "temperature": "तापमान",
-        "humidity": "आर्द्रता",
-        "rainfall": "वर्षा (पिछले 1 घंटे में)",
-        "condition": "स्थिति",
-        "advice": "सिंचाई सलाह",
-        "recommended": "सिंचाई की सिफारिश की जाती है",
-        "not_needed": "सिंचाई की आवश्यकता नहीं है",
-        "saving_score": "जल बचत स्कोर",
-        "error_weather": "मौसम डेटा प्राप्त करने में असमर्थ। कृपया अपना स्थान जांचें।",
-        "error_api": "मौसम सेवा अस्थायी रूप से अनुपलब्ध है। कृपया बाद में पुनः प्रयास करें।"
+# Translated UI labels with attribute access (labels.weather)
+Labels = namedtuple("Labels", [
+    "weather", "temperature", "humidity", "rainfall", "condition", "advice",
+    "recommended", "not_needed", "saving_score", "error_weather", "error_api"
+])
+
+@st.cache_resource
+def _static_tables():
+    """Build the static lookup tables once per process"""
+    # Language Dictionary (basic multilingual support)
+    translations = {
+        "English": {
+            "weather": "Weather Data",
+            "temperature": "Temperature",
+            "humidity": "Humidity",
+            "rainfall": "Rainfall (last 1hr)",
+            "condition": "Condition",
+            "advice": "Irrigation Advice",
+            "recommended": "Irrigation Recommended",
+            "not_needed": "No Irrigation Needed",
+            "saving_score": "Water Saving Score",
+            "error_weather": "Unable to fetch weather data. Please check your location.",
+            "error_api": "Weather service temporarily unavailable. Please try again later."
+        },
+        "Gujarati": {
+            "weather": "હવામાન માહિતી",
+            "temperature": "તાપમાન",
+            "humidity": "ભેજ",
+            "rainfall": "વર્ષા (છેલ્લા 1 કલાકમાં)",
+            "condition": "હવામાન સ્થિતિ",
+            "advice": "સિંચાઇ સલાહ",
+            "recommended": "સિંચાઇ કરવાની ભલામણ છે",
+            "not_needed": "સિંચાઇની જરૂર નથી",
+            "saving_score": "પાણી બચાવ સ્કોર",
+            "error_weather": "હવામાન માહિતી મેળવવામાં અસમર્થ. કૃપા કરીને તમારું સ્થાન તપાસો.",
+            "error_api": "હવામાન સેવા અસ્થાયી રૂપે અનુપલબ્ધ છે. કૃપા કરીને ફરીથી પ્રયાસ કરો."
+        },
+        "Hindi": {
+            "weather": "मौसम की जानकारी",
+            "temperature": "तापमान",
+            "humidity": "आर्द्रता",
+            "rainfall": "वर्षा (पिछले 1 घंटे में)",
+            "condition": "स्थिति",
+            "advice": "सिंचाई सलाह",
+            "recommended": "सिंचाई की सिफारिश की जाती है",
+            "not_needed": "सिंचाई की आवश्यकता नहीं है",
+            "saving_score": "जल बचत स्कोर",
+            "error_weather": "मौसम डेटा प्राप्त करने में असमर्थ। कृपया अपना स्थान जांचें।",
+            "error_api": "मौसम सेवा अस्थायी रूप से अनुपलब्ध है। कृपया बाद में पुनः प्रयास करें।"
+        }
     }
-}
 
-labels = translations[language]
+    # Enhanced crop-specific irrigation logic
+    crop_requirements = MappingProxyType({
+        "Wheat": {"min_moisture": 30, "temp_threshold": 25, "rain_threshold": 3},
+        "Rice": {"min_moisture": 70, "temp_threshold": 30, "rain_threshold": 8},
+        "Cotton": {"min_moisture": 35, "temp_threshold": 28, "rain_threshold": 5},
+        "Sugarcane": {"min_moisture": 60, "temp_threshold": 32, "rain_threshold": 10},
+        "Maize": {"min_moisture": 40, "temp_threshold": 26, "rain_threshold": 4},
+        "Barley": {"min_moisture": 25, "temp_threshold": 24, "rain_threshold": 3},
+        "Soybean": {"min_moisture": 45, "temp_threshold": 27, "rain_threshold": 6}
+    })
+
+    labels_by_language = {lang: Labels(**text) for lang, text in translations.items()}
+    return labels_by_language, crop_requirements
 
-# Enhanced crop-specific irrigation logic
-crop_requirements = {
-    "Wheat": {"min_moisture": 30, "temp_threshold": 25, "rain_threshold": 3},
-    "Rice": {"min_moisture": 70, "temp_threshold": 30, "rain_threshold": 8},
-    "Cotton": {"min_moisture": 35, "temp_threshold": 28, "rain_threshold": 5},
-    "Sugarcane": {"min_moisture": 60, "temp_threshold": 32, "rain_threshold": 10},
-    "Maize": {"min_moisture": 40, "temp_threshold": 26, "rain_threshold": 4},
-    "Barley": {"min_moisture": 25, "temp_threshold": 24, "rain_threshold": 3},
-    "Soybean": {"min_moisture": 45, "temp_threshold": 27, "rain_threshold": 6}
-}
+LABELS, crop_requirements = _static_tables()
+labels = LABELS[language]
 
 # OpenWeatherMap API Setup
 api_key = st.secrets.get("OPENWEATHER_API_KEY", "c3189205c860439e4727a7a27fd77a7d")
 
+@st.cache_resource
+def get_http_session():
+    """Shared HTTP session so repeated requests reuse the TLS connection"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    ))
+    return session
+
+# Cached as a resource so the pool survives Streamlit reruns
+SESSION = get_http_session()
+
+# Columnar schema of the irrigation log
+LOG_SCHEMA = pa.schema([
+    ("datetime", pa.string()),
+    ("location", pa.string()),
+    ("crop", pa.string()),
+    ("soil_moisture", pa.int64()),
+    ("temperature", pa.float64()),
+    ("humidity", pa.float64()),
+    ("rainfall", pa.float64()),
+    ("weather", pa.string()),
+    ("irrigation", pa.string()),
+    ("priority", pa.string())
+])
+LOG_FIELDS = LOG_SCHEMA.names
+# Appended rows are merged into one chunk once this many chunks accumulate
+LOG_MAX_CHUNKS = 32
+
 # Initialize session state for logging
 if 'irrigation_logs' not in st.session_state:
-    st.session_state.irrigation_logs = []
+    # Logs are kept as an Arrow table rather than a list of dicts
+    st.session_state.irrigation_logs = LOG_SCHEMA.empty_table()
+if 'recommended_count' not in st.session_state:
+    st.session_state.recommended_count = 0
+if 'csv_buf' not in st.session_state:
+    # CSV is built incrementally so export doesn't re-serialize the whole log
+    st.session_state.csv_buf = StringIO()
+    st.session_state.csv_writer = csv.DictWriter(
+        st.session_state.csv_buf, fieldnames=LOG_FIELDS, lineterminator="\n"
+    )
+    st.session_state.csv_writer.writeheader()
 
-def get_irrigation_advice(crop, soil_moisture, temp, humidity, rainfall):
-    """Enhanced irrigation logic based on crop type and conditions"""
-    req = crop_requirements.get(crop, crop_requirements["Wheat"])
-    
-    # Multiple factors for irrigation decision
-    factors = {
-        "low_moisture": soil_moisture < req["min_moisture"],
-        "high_temp": temp > req["temp_threshold"],
-        "low_rainfall": rainfall < req["rain_threshold"],
-        "low_humidity": humidity < 40
-    }
-    
-    # Decision logic
-    irrigation_score = sum(factors.values())
+# Advice indexed by priority level: 0 = not needed, 1 = medium, 2 = high
+ADVICE_LEVELS = (
+    (False, "Not Needed", 95),
+    (True, "Medium Priority", 85),
+    (True, "High Priority", 75)
+)
+
+def get_irrigation_advice(soil_moisture, temp, humidity, rainfall, min_moisture, temp_threshold, rain_threshold):
+    """Enhanced irrigation logic based on crop thresholds and conditions"""
+    # Number of factors favouring irrigation
+    score = (
+        (soil_moisture < min_moisture) + (temp > temp_threshold)
+        + (rainfall < rain_threshold) + (humidity < 40)
+    )
     
-    if irrigation_score >= 3:
-        return True, "High Priority", 75
-    elif irrigation_score >= 2:
-        return True, "Medium Priority", 85
-    else:
-        return False, "Not Needed", 95
+    return ADVICE_LEVELS[(score >= 2) + (score >= 3)]
+
+@st.cache_resource
+def get_score_kernel():
+    """Compiled batch version of the irrigation factor score"""
+    # Imported here so numba stays off the cold-start path
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional; fall back to the plain Python loop
+        return score_batch
+    return njit(cache=True)(score_batch)
+
+def score_logs(logs):
+    """Re-score every logged row against the current crop thresholds"""
+    crops = list(crop_requirements)
+    thresholds = np.array([
+        [req["min_moisture"], req["temp_threshold"], req["rain_threshold"]]
+        for req in crop_requirements.values()
+    ], dtype=np.float64)
+    idx = pc.index_in(logs['crop'], value_set=pa.array(crops)).fill_null(crops.index("Wheat")).to_numpy()
+    mm, tt, rt = thresholds[idx].T
+    sm, temp, hum, rain = (
+        logs[name].to_numpy().astype(np.float64)
+        for name in ('soil_moisture', 'temperature', 'humidity', 'rainfall')
+    )
+    return get_score_kernel()(
+        sm, temp, hum, rain,
+        np.ascontiguousarray(mm), np.ascontiguousarray(tt), np.ascontiguousarray(rt)
+    )
+
+@st.cache_data(persist="disk", max_entries=256, show_spinner=False)
+def geocode(location, api_key):
+    """Resolve a location name to (lat, lon); raises LookupError if it isn't found"""
+    geo_url = "https://api.openweathermap.org/geo/1.0/direct"
+    # params= so names containing '&' or '#' are encoded rather than splitting the query
+    response = SESSION.get(
+        geo_url, params={"q": location, "limit": 1, "appid": api_key}, timeout=(3, 7)
+    )
+    response.raise_for_status()
+    matches = parse_json(response.content)
+    if not matches:
+        # Raised rather than returned so Streamlit doesn't persist the miss
+        raise LookupError(location)
+    return matches[0]['lat'], matches[0]['lon']
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_weather(lat, lon, api_key):
+    """Fetch current weather for coordinates (cached for 10 minutes)"""
+    weather_url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={api_key}&units=metric"
+    response = SESSION.get(weather_url, timeout=(3, 7))
+    response.raise_for_status()
+    return parse_json(response.content)
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_forecast(lat, lon, api_key):
+    """Fetch the 5-day forecast as daily rainfall totals (cached for 10 minutes)"""
+    forecast_url = f"https://api.openweathermap.org/data/2.5/forecast?lat={lat}&lon={lon}&appid={api_key}&units=metric"
+    response = SESSION.get(forecast_url, timeout=(3, 7))
+    response.raise_for_status()
+    data = parse_json(response.content)
+    if not isinstance(data, dict):
+        raise ValueError("Unexpected forecast response")
+
+    # Sum the 3-hourly rain amounts per local day
+    offset = datetime.timedelta(seconds=data.get('city', {}).get('timezone', 0))
+    daily = {}
+    slots = {}
+    for entry in data.get('list', []):
+        day = (datetime.datetime.fromtimestamp(entry['dt'], datetime.timezone.utc) + offset).strftime("%a")
+        daily[day] = daily.get(day, 0.0) + entry.get('rain', {}).get('3h', 0.0)
+        slots[day] = slots.get(day, 0) + 1
+
+    # Keep today plus only the following days covered by all eight slots,
+    # so a partly covered last day doesn't understate its rainfall
+    return tuple(
+        (day, rain) for i, (day, rain) in enumerate(daily.items())
+        if i == 0 or slots[day] == 8
+    )
+
+def fetch_weather_and_forecast(lat, lon, api_key):
+    """Fetch current weather and the forecast concurrently"""
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=2,
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    ) as executor:
+        weather_future = executor.submit(fetch_weather, lat, lon, api_key)
+        forecast_future = executor.submit(fetch_forecast, lat, lon, api_key)
+        weather = weather_future.result()
+        try:
+            forecast = forecast_future.result()
+        except (requests.exceptions.RequestException, KeyError, TypeError, ValueError):
+            # The forecast is optional; the chart falls back to a simulation
+            forecast = None
+    return weather, forecast
+
+def _pyplot():
+    """Import pyplot lazily on the non-interactive Agg backend"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    plt.rcParams['path.simplify'] = True
+    plt.rcParams['agg.path.chunksize'] = 10000
+    return plt
+
+def _fig_to_png(fig):
+    """Render a figure to PNG bytes"""
+    buf = BytesIO()
+    fig.savefig(buf, format='png', dpi=90)
+    return buf.getvalue()
+
+@st.cache_resource
+def _chart_figures():
+    """Figures reused across renders; the lock serializes drawing between sessions"""
+    plt = _pyplot()
+    conditions = plt.subplots(1, 2, figsize=(12, 4))
+    forecast = plt.subplots(figsize=(10, 4))
+    return threading.Lock(), conditions, forecast
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def build_conditions_fig(soil_moisture, req_moisture, temp, humidity, rainfall):
+    """Current conditions chart as PNG bytes"""
+    lock, (fig, (ax1, ax2)), _ = _chart_figures()
+    with lock:
+        ax1.clear()
+        ax2.clear()
+
+        # Moisture vs Requirement
+        ax1.bar(['Current', 'Required'], [soil_moisture, req_moisture], 
+               color=['skyblue', 'lightcoral'])
+        ax1.set_ylabel('Soil Moisture (%)')
+        ax1.set_title('Soil Moisture Comparison')
+        ax1.axhline(y=req_moisture, color='red', linestyle='--', alpha=0.7)
+
+        # Weather conditions
+        conditions = ['Temperature', 'Humidity', 'Rainfall']
+        values = [temp, humidity, rainfall * 10]  # Scale rainfall for visibility
+        ax2.bar(conditions, values, color=['orange', 'green', 'blue'])
+        ax2.set_ylabel('Values')
+        ax2.set_title('Current Weather Conditions')
+
+        return _fig_to_png(fig)
+
+# Simulated day-to-day rainfall drift relative to today
+_FORECAST_OFFSETS = (np.arange(7) - 3) * 0.5
+
+def simulated_forecast(rainfall):
+    """Simulated 7-day rainfall used when no forecast data is available"""
+    days = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+    return days, np.maximum(rainfall + _FORECAST_OFFSETS, 0.0)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def build_forecast_fig(crop, days, forecast_rain, rain_threshold, simulated=False):
+    """Rainfall forecast chart as PNG bytes"""
+    title = f"{len(days)}-Day Rainfall Forecast" + (" (Simulated)" if simulated else "")
+
+    lock, _, (fig, ax) = _chart_figures()
+    with lock:
+        ax.clear()
+        bars = ax.bar(days, forecast_rain, color='skyblue', alpha=0.7)
+        ax.set_ylabel("Rainfall (mm)")
+        ax.set_title(title)
+        ax.axhline(y=rain_threshold, 
+                  color='red', linestyle='--', alpha=0.7, 
+                  label=f'{crop} Rain Threshold')
+        ax.legend()
+
+        # Highlight today
+        bars[0].set_color('orange')
+        bars[0].set_alpha(1.0)
+
+        return _fig_to_png(fig)
 
 def log_irrigation_data(data):
     """Log irrigation data to session state"""
-    st.session_state.irrigation_logs.append(data)
+    row = pa.Table.from_pylist([data], schema=LOG_SCHEMA)
+    logs = pa.concat_tables([st.session_state.irrigation_logs, row])
+    # Single-row chunks carry far more buffer overhead than the rows themselves
+    if logs.column(0).num_chunks > LOG_MAX_CHUNKS:
+        logs = logs.combine_chunks()
+    st.session_state.irrigation_logs = logs
+    if data['irrigation'] != labels.not_needed:
+        st.session_state.recommended_count += 1
+    st.session_state.csv_writer.writerow(data)
 
 def export_logs():
     """Export logs as CSV"""
-    if st.session_state.irrigation_logs:
-        df = pd.DataFrame(st.session_state.irrigation_logs)
-        return df.to_csv(index=False)
+    if st.session_state.irrigation_logs.num_rows:
+        return st.session_state.csv_buf.getvalue()
     return None
 
+@st.fragment
+def download_section():
+    """Build the CSV only on request; clicks here rerun just this fragment"""
+    if st.button("Prepare Log Download"):
+        csv_data = export_logs()
+        if csv_data:
+            st.download_button(
+                label="📥 Download Complete Log",
+                data=csv_data,
+                file_name=f"irrigation_log_{datetime.datetime.now().strftime('%Y%m%d')}.csv",
+                mime="text/csv",
+                on_click="ignore"  # Keep the button visible after downloading
+            )
+
+def render_results(result):
+    """Display weather, advice and analysis tabs for the last fetched result"""
+    crop = result["crop"]
+    min_moist, _, rain_thr = result["thresholds"]
+    temp, humidity, rainfall = result["temperature"], result["humidity"], result["rainfall"]
+    irrigate, priority, water_score = result["advice"]
+
+    # Weather display
+    st.subheader(f"🌧️ {labels.weather}")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric(labels.temperature, f"{temp}°C")
+        st.metric(labels.humidity, f"{humidity}%")
+    with col2:
+        st.metric(labels.rainfall, f"{rainfall} mm")
+        st.metric(labels.condition, result["weather"])
+
+    st.subheader(f"💧 {labels.advice}")
+    if irrigate:
+        st.success(f"{labels.recommended} for {crop} - {priority}")
+        st.metric(labels.saving_score, f"{water_score}%", 
+                 delta=f"{priority}", delta_color="inverse")
+    else:
+        st.info(f"{labels.not_needed} for {crop}")
+        st.metric(labels.saving_score, f"{water_score}%", 
+                 delta="Optimal", delta_color="normal")
+
+    # Enhanced visualization
+    st.subheader("📊 Analysis Dashboard")
+    
+    # Create tabs for different visualizations
+    tab1, tab2, tab3 = st.tabs(["Conditions", "Forecast", "History"])
+    
+    with tab1:
+        # Current conditions chart
+        st.image(build_conditions_fig(result["soil_moisture"], min_moist, temp, humidity, rainfall))
+    
+    with tab2:
+        if result["forecast"]:
+            days, forecast_rain = zip(*result["forecast"])
+            st.image(build_forecast_fig(crop, days, forecast_rain, rain_thr))
+        else:
+            days, forecast_rain = simulated_forecast(rainfall)
+            st.image(build_forecast_fig(crop, days, forecast_rain, rain_thr, simulated=True))
+    
+    with tab3:
+        # Show recent logs
+        logs = st.session_state.irrigation_logs
+        if logs.num_rows:
+            recent_logs = logs.slice(max(0, logs.num_rows - 5))  # Last 5 entries
+            # Arrow tables go to the frontend without a pandas round-trip
+            st.dataframe(recent_logs, use_container_width=True)
+            
+            # Priority breakdown over the full history
+            high, medium, not_needed = result["history_counts"]
+            st.caption(
+                f"High Priority: {high} · "
+                f"Medium Priority: {medium} · "
+                f"Not Needed: {not_needed}"
+            )
+            
+            # Export functionality
+            download_section()
+        else:
+            st.info("No irrigation history available yet.")
+
+# Thresholds for the selected crop, shared by the advice and the sidebar
+req = crop_requirements[crop_type]
+min_moist, temp_thr, rain_thr = req["min_moisture"], req["temp_threshold"], req["rain_threshold"]
+
 # --- Fetch Weather Data ---
 if st.button("Get Irrigation Advice", type="primary"):
+    # Drop the previous result so a failed lookup doesn't show stale advice
+    st.session_state.pop('last_result', None)
     if not location.strip():
         st.error("Please enter a valid location.")
     else:
-        weather_url = f"https://api.openweathermap.org/data/2.5/weather?q={location}&appid={api_key}&units=metric"
-        
         try:
             with st.spinner("Fetching weather data..."):
-                response = requests.get(weather_url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
+                # Normalize so "Delhi" and "delhi " share a cache entry
+                try:
+                    coords = geocode(location.strip().lower(), api_key)
+                except LookupError:
+                    data = forecast = None
+                else:
+                    data, forecast = fetch_weather_and_forecast(*coords, api_key)
 
-            if data.get("cod") != 200:
-                st.error(f"{labels['error_weather']}: {data.get('message', 'Unknown error')}")
+            if data is None:
+                st.error(labels.error_weather)
+            elif data.get("cod") != 200:
+                st.error(f"{labels.error_weather}: {data.get('message', 'Unknown error')}")
             else:
                 temp = data['main']['temp']
                 humidity = data['main']['humidity']
@@ -135,32 +470,11 @@ if st.button("Get Irrigation Advice", type="primary"):
                 rain_data = data.get("rain", {})
                 rainfall = rain_data.get("1h", rain_data.get("3h", 0.0))
 
-                # Weather display
-                st.subheader(f"🌧️ {labels['weather']}")
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric(labels['temperature'], f"{temp}°C")
-                    st.metric(labels['humidity'], f"{humidity}%")
-                with col2:
-                    st.metric(labels['rainfall'], f"{rainfall} mm")
-                    st.metric(labels['condition'], weather)
-
                 # Get irrigation advice
                 irrigate, priority, water_score = get_irrigation_advice(
-                    crop_type, soil_moisture, temp, humidity, rainfall
+                    soil_moisture, temp, humidity, rainfall, min_moist, temp_thr, rain_thr
                 )
-
-                st.subheader(f"💧 {labels['advice']}")
-                if irrigate:
-                    st.success(f"{labels['recommended']} for {crop_type} - {priority}")
-                    st.metric(labels['saving_score'], f"{water_score}%", 
-                             delta=f"{priority}", delta_color="inverse")
-                    result = labels['recommended']
-                else:
-                    st.info(f"{labels['not_needed']} for {crop_type}")
-                    st.metric(labels['saving_score'], f"{water_score}%", 
-                             delta="Optimal", delta_color="normal")
-                    result = labels['not_needed']
+                result = labels.recommended if irrigate else labels.not_needed
 
                 # Log data
                 log_data = {
@@ -177,99 +491,54 @@ if st.button("Get Irrigation Advice", type="primary"):
                 }
                 log_irrigation_data(log_data)
 
-                # Enhanced visualization
-                st.subheader("📊 Analysis Dashboard")
-                
-                # Create tabs for different visualizations
-                tab1, tab2, tab3 = st.tabs(["Conditions", "Forecast", "History"])
-                
-                with tab1:
-                    # Current conditions chart
-                    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 4))
-                    
-                    # Moisture vs Requirement
-                    req_moisture = crop_requirements[crop_type]["min_moisture"]
-                    ax1.bar(['Current', 'Required'], [soil_moisture, req_moisture], 
-                           color=['skyblue', 'lightcoral'])
-                    ax1.set_ylabel('Soil Moisture (%)')
-                    ax1.set_title('Soil Moisture Comparison')
-                    ax1.axhline(y=req_moisture, color='red', linestyle='--', alpha=0.7)
-                    
-                    # Weather conditions
-                    conditions = ['Temperature', 'Humidity', 'Rainfall']
-                    values = [temp, humidity, rainfall * 10]  # Scale rainfall for visibility
-                    ax2.bar(conditions, values, color=['orange', 'green', 'blue'])
-                    ax2.set_ylabel('Values')
-                    ax2.set_title('Current Weather Conditions')
-                    
-                    st.pyplot(fig)
-                
-                with tab2:
-                    # Simulated forecast
-                    days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-                    forecast_rain = [max(0, rainfall + (i-3)*0.5) for i in range(7)]
-                    
-                    fig, ax = plt.subplots(figsize=(10, 4))
-                    bars = ax.bar(days, forecast_rain, color='skyblue', alpha=0.7)
-                    ax.set_ylabel("Rainfall (mm)")
-                    ax.set_title("7-Day Rainfall Forecast (Simulated)")
-                    ax.axhline(y=crop_requirements[crop_type]["rain_threshold"], 
-                              color='red', linestyle='--', alpha=0.7, 
-                              label=f'{crop_type} Rain Threshold')
-                    ax.legend()
-                    
-                    # Highlight today
-                    bars[0].set_color('orange')
-                    bars[0].set_alpha(1.0)
-                    
-                    st.pyplot(fig)
-                
-                with tab3:
-                    # Show recent logs
-                    if st.session_state.irrigation_logs:
-                        recent_logs = st.session_state.irrigation_logs[-5:]  # Last 5 entries
-                        df = pd.DataFrame(recent_logs)
-                        st.dataframe(df, use_container_width=True)
-                        
-                        # Export functionality
-                        csv_data = export_logs()
-                        if csv_data:
-                            st.download_button(
-                                label="📥 Download Complete Log",
-                                data=csv_data,
-                                file_name=f"irrigation_log_{datetime.datetime.now().strftime('%Y%m%d')}.csv",
-                                mime="text/csv"
-                            )
-                    else:
-                        st.info("No irrigation history available yet.")
+                # Keep the result so later reruns redisplay it without refetching
+                scores = score_logs(st.session_state.irrigation_logs)
+                st.session_state.last_result = {
+                    "crop": crop_type,
+                    "thresholds": (min_moist, temp_thr, rain_thr),
+                    "soil_moisture": soil_moisture,
+                    "temperature": temp,
+                    "humidity": humidity,
+                    "rainfall": rainfall,
+                    "weather": weather,
+                    "forecast": forecast,
+                    "advice": (irrigate, priority, water_score),
+                    "history_counts": (
+                        int((scores >= 3).sum()),
+                        int((scores == 2).sum()),
+                        int((scores < 2).sum())
+                    )
+                }
 
         except requests.exceptions.Timeout:
-            st.error(f"{labels['error_api']} (Timeout)")
+            st.error(f"{labels.error_api} (Timeout)")
         except requests.exceptions.ConnectionError:
-            st.error(f"{labels['error_api']} (Connection Error)")
+            st.error(f"{labels.error_api} (Connection Error)")
         except requests.exceptions.RequestException as e:
-            st.error(f"{labels['error_api']}: {str(e)}")
+            st.error(f"{labels.error_api}: {str(e)}")
         except Exception as e:
             st.error(f"An unexpected error occurred: {str(e)}")
 
+# Widget changes rerun the script; show the last result instead of recomputing it
+if 'last_result' in st.session_state:
+    render_results(st.session_state.last_result)
+
 # Sidebar with additional information
 with st.sidebar:
     st.header("📋 Crop Information")
-    selected_crop = crop_requirements.get(crop_type, {})
-    if selected_crop:
-        st.write(f"**{crop_type} Requirements:**")
-        st.write(f"• Min Soil Moisture: {selected_crop['min_moisture']}%")
-        st.write(f"• Temperature Threshold: {selected_crop['temp_threshold']}°C")
-        st.write(f"• Rain Threshold: {selected_crop['rain_threshold']}mm")
+    st.write(f"**{crop_type} Requirements:**")
+    st.write(f"• Min Soil Moisture: {min_moist}%")
+    st.write(f"• Temperature Threshold: {temp_thr}°C")
+    st.write(f"• Rain Threshold: {rain_thr}mm")
     
     st.header("🌍 About")
     st.write("This smart irrigation system helps optimize water usage for different crops based on real-time weather conditions.")
     
-    if st.session_state.irrigation_logs:
+    logs = st.session_state.irrigation_logs
+    if logs.num_rows:
         st.header("📊 Quick Stats")
-        total_checks = len(st.session_state.irrigation_logs)
-        irrigation_recommended = sum(1 for log in st.session_state.irrigation_logs 
-                                   if log['irrigation'] != labels['not_needed'])
+        total_checks = logs.num_rows
+        irrigation_recommended = st.session_state.recommended_count
         st.metric("Total Checks", total_checks)
         st.metric("Irrigation Recommended", irrigation_recommended)
         if total_checks > 0:
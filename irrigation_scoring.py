@@ -0,0 +1,13 @@
+import numpy as np
+
+def score_batch(sm, temp, hum, rain, mm, tt, rt):
+    """Number of factors favouring irrigation (0-4) for each row"""
+    n = sm.shape[0]
+    out = np.empty(n, np.int8)
+    for i in range(n):
+        # int() so NumPy bools add up instead of OR-ing when run without numba
+        out[i] = (
+            int(sm[i] < mm[i]) + int(temp[i] > tt[i])
+            + int(rain[i] < rt[i]) + int(hum[i] < 40)
+        )
+    return out
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from irrigation_scoring import score_batch
+
+
+def _rows():
+    # soil moisture, temperature, humidity, rainfall against Wheat thresholds
+    sm = np.array([10.0, 50.0, 20.0, 50.0])
+    temp = np.array([35.0, 20.0, 30.0, 20.0])
+    hum = np.array([20.0, 80.0, 60.0, 30.0])
+    rain = np.array([0.0, 10.0, 5.0, 10.0])
+    mm = np.full(4, 30.0)
+    tt = np.full(4, 25.0)
+    rt = np.full(4, 3.0)
+    return sm, temp, hum, rain, mm, tt, rt
+
+
+def test_score_batch_counts_every_factor():
+    assert score_batch(*_rows()).tolist() == [4, 0, 2, 1]
+
+
+def test_score_batch_matches_compiled_kernel():
+    numba = pytest.importorskip("numba")
+    compiled = numba.njit(score_batch)
+    rows = _rows()
+    assert compiled(*rows).tolist() == score_batch(*rows).tolist()